@@ -1,15 +1,40 @@
 import sys
 import os
+import codecs
+import mmap
+import string
+import tempfile
+import zipfile
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTextEdit, QVBoxLayout, QWidget,
                              QMenuBar, QAction, QFileDialog, QLabel, QPushButton, QHBoxLayout,
                              QSplitter)
 from PyQt5.QtGui import QTextCursor, QColor, QTextCharFormat, QFont, QSyntaxHighlighter
-from PyQt5.QtCore import Qt, QRegularExpression
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Escaner en Cython (lexer_c.pyx); se compila con: python setup.py build_ext --inplace
+try:
+    import lexer_c
+except ImportError:
+    lexer_c = None
 
 class CustomLanguage:
     KEYWORDS = ["if", "else", "while", "for", "function", "return",
                 "int", "float", "string", "bool", "true", "false",
                 "print", "input", "and", "or", "not"]
+    KEYWORDS_SET = frozenset(KEYWORDS)
 
     COLORS = {
         "keyword": QColor(88, 129, 87),
@@ -19,46 +44,83 @@ class CustomLanguage:
         "identifier": QColor(163, 190, 140)
     }
 
+# Formatos compartidos por todos los resaltadores, creados una sola vez al importar
+_KEYWORD_FMT = QTextCharFormat()
+_KEYWORD_FMT.setForeground(CustomLanguage.COLORS["keyword"])
+_KEYWORD_FMT.setFontWeight(QFont.Bold)
+
+_NUMBER_FMT = QTextCharFormat()
+_NUMBER_FMT.setForeground(CustomLanguage.COLORS["number"])
+
+_STRING_FMT = QTextCharFormat()
+_STRING_FMT.setForeground(CustomLanguage.COLORS["string"])
+
+_COMMENT_FMT = QTextCharFormat()
+_COMMENT_FMT.setForeground(CustomLanguage.COLORS["comment"])
+
 class SyntaxHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.highlighting_rules = []
+    def highlightBlock(self, text):
+        """Recorre el bloque una sola vez, decidiendo por el primer caracter de cada token"""
+        # Qt mide las posiciones en unidades UTF-16: si hay caracteres fuera del BMP
+        # (que ocupan dos unidades) se traducen los indices de str con una tabla de prefijos
+        if text.isascii() or max(text) <= '\uffff':
+            self._utf16 = None
+        else:
+            self._utf16 = list(accumulate((2 if ord(c) > 0xFFFF else 1 for c in text), initial=0))
 
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(CustomLanguage.COLORS["keyword"])
-        keyword_format.setFontWeight(QFont.Bold)
+        i = 0
+        n = len(text)
 
-        for word in CustomLanguage.KEYWORDS:
-            pattern = QRegularExpression(r"\b" + word + r"\b")
-            self.highlighting_rules.append((pattern, keyword_format))
+        while i < n:
+            char = text[i]
 
-        number_format = QTextCharFormat()
-        number_format.setForeground(CustomLanguage.COLORS["number"])
-        pattern = QRegularExpression(r"\b\d+(\.\d+)?\b")
-        self.highlighting_rules.append((pattern, number_format))
+            if char.isalpha() or char == '_':
+                start = i
+                while i < n and (text[i].isalnum() or text[i] == '_'):
+                    i += 1
+                if text[start:i] in CustomLanguage.KEYWORDS_SET:
+                    self._set_format(start, i, _KEYWORD_FMT)
+                continue
 
-        string_format = QTextCharFormat()
-        string_format.setForeground(CustomLanguage.COLORS["string"])
-        pattern = QRegularExpression(r'\".*?\"')
-        self.highlighting_rules.append((pattern, string_format))
+            if char.isdigit():
+                start = i
+                while i < n and text[i].isdigit():
+                    i += 1
+                if i + 1 < n and text[i] == '.' and text[i + 1].isdigit():
+                    i += 1
+                    while i < n and text[i].isdigit():
+                        i += 1
+                self._set_format(start, i, _NUMBER_FMT)
+                continue
 
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(CustomLanguage.COLORS["comment"])
-        pattern = QRegularExpression(r"//[^\n]*")
-        self.highlighting_rules.append((pattern, comment_format))
+            if char == '"':
+                end = text.find('"', i + 1)
+                if end == -1:
+                    i += 1
+                    continue
+                self._set_format(i, end + 1, _STRING_FMT)
+                i = end + 1
+                continue
 
-    def highlightBlock(self, text):
-        for pattern, format in self.highlighting_rules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
+            if char == '/' and i + 1 < n and text[i + 1] == '/':
+                self._set_format(i, n, _COMMENT_FMT)
+                break
+
+            i += 1
+
+    def _set_format(self, start, end, text_format):
+        """Aplica el formato al rango [start, end) de indices de str del bloque actual"""
+        if self._utf16 is not None:
+            start, end = self._utf16[start], self._utf16[end]
+        self.setFormat(start, end - start, text_format)
 
 
 class SymbolTable:
     def __init__(self, filename="tabla_simbolos.dat"):
         self.filename = filename
-        self.symbols = []
+        # Copia binaria de la tabla (si hay NumPy); el .dat es la vista legible que se regenera en save()
+        self.binary_filename = os.path.splitext(filename)[0] + ".npz"
+        self.types, self.values, self.lines = [], [], []
         self._create_file()
         self.load()
 
@@ -79,79 +141,425 @@ class SymbolTable:
                 f.write("---------------------------\n")
 
     def add_symbol(self, token_type, token_value, line_number):
-        symbol = {
-            "type": token_type,
-            "value": token_value,
-            "line": line_number
-        }
-        self.symbols.append(symbol)
-        self.save()
+        self.types.append(token_type)
+        self.values.append(token_value)
+        self.lines.append(line_number)
 
     def save(self):
-        with open(self.filename, 'w') as f:
-            f.write("=== TABLA DE SIMBOLOS ===\n")
-            f.write("Formato: Tipo | Valor | Linea\n")
-            f.write("---------------------------\n")
+        """Escribe la tabla completa en una sola llamada a write"""
+        header = "=== TABLA DE SIMBOLOS ===\n"
+        header += "Formato: Tipo | Valor | Linea\n"
+        header += "---------------------------\n"
+        rows = "".join(f"{t}\t{v}\t{l}\n" for t, v, l in zip(self.types, self.values, self.lines))
 
-            for symbol in self.symbols:
-                f.write(f"{symbol['type']}\t{symbol['value']}\t{symbol['line']}\n")
+        with open(self.filename, 'w') as f:
+            f.write(header + rows)
+
+        if np is not None:
+            # Los valores van como un solo bloque UTF-8 con sus offsets, sin rellenar
+            # cada uno al largo del literal mas largo
+            encoded = [v.encode('utf-8', 'surrogatepass') for v in self.values]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+            # Se escribe a un temporal en la misma carpeta y se reemplaza de una vez, para
+            # que un fallo a mitad de escritura no deje un .npz vacio o truncado
+            fd, tmp_name = tempfile.mkstemp(suffix=".npz",
+                                            dir=os.path.dirname(os.path.abspath(self.binary_filename)))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f,
+                             types=np.array(self.types, dtype='U24'),
+                             values=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                             value_offsets=offsets,
+                             lines=np.array(self.lines, dtype=np.int32))
+                os.replace(tmp_name, self.binary_filename)
+            except BaseException:
+                os.remove(tmp_name)
+                raise
 
     def load(self):
+        if self._load_binary():
+            return
+
         if os.path.exists(self.filename):
             with open(self.filename, 'r') as f:
-                lines = f.readlines()
-                for line in lines[8:]:
+                for line in f:
                     parts = line.strip().split("\t")
-                    if len(parts) == 3:
-                        self.symbols.append({
-                            "type": parts[0],
-                            "value": parts[1],
-                            "line": int(parts[2])
-                        })
+                    if len(parts) == 3 and parts[2].isdigit():
+                        self.add_symbol(parts[0], parts[1], int(parts[2]))
+
+    def _load_binary(self):
+        """Carga la copia .npz si existe y no es mas vieja que el .dat; devuelve si pudo"""
+        if np is None or not os.path.exists(self.binary_filename):
+            return False
+        if os.path.getmtime(self.binary_filename) < os.path.getmtime(self.filename):
+            return False
+
+        try:
+            with np.load(self.binary_filename) as data:
+                types, lines = data["types"], data["lines"]
+                blob = data["values"].tobytes()
+                offsets = data["value_offsets"].tolist()
+                if not len(types) == len(lines) == len(offsets) - 1 or offsets[-1] != len(blob):
+                    return False
+                values = [blob[start:end].decode('utf-8', 'surrogatepass')
+                          for start, end in zip(offsets, offsets[1:])]
+                self.types, self.values, self.lines = types.tolist(), values, lines.tolist()
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            return False
+        return True
 
     def clear(self):
-        self.symbols = []
-        self.save()
+        """Vacia la tabla en memoria; el archivo se actualiza en el siguiente save()"""
+        self.types, self.values, self.lines = [], [], []
 
     def __str__(self):
         header = "=== TABLA DE SIMBOLOS ===\n"
         header += "Tipo             Valor               Linea\n"
         header += "-----------------------------------------\n"
-        symbols_str = "\n".join([f"{s['type']:15} {s['value']:20} Linea: {s['line']}"
-                                 for s in self.symbols])
+        symbols_str = "\n".join("%-15s %-20s Linea: %d" % row
+                                for row in zip(self.types, self.values, self.lines))
         return header + symbols_str
 
+# Caracteres ASCII de identificadores y numeros para el analizador en Python;
+# los caracteres Unicode se siguen clasificando con str.isalnum/isdigit
+_IDENT_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+_NUMBER_CHARS = frozenset(string.digits + ".")
+_OPERATORS = frozenset("+-*/=!<>&|(){}[];,")
+_TWO_CHAR_OPERATORS = frozenset({"==", "!=", "<=", ">=", "&&", "||"})
+
+# Bits de clase de caracter para las mascaras de NumPy del analizador en Python
+_CLASS_IDENT = 1
+_CLASS_NUMBER = 2
+_CLASS_SPACE = 4
+
+def _char_class(char):
+    return ((_CLASS_IDENT if char.isalnum() or char == '_' else 0)
+            | (_CLASS_NUMBER if char.isdigit() or char == '.' else 0)
+            | (_CLASS_SPACE if char.isspace() and char != '\n' else 0))
+
+if np is not None:
+    _ASCII_CLASSES = np.array([_char_class(chr(c)) for c in range(128)], dtype=np.uint8)
+
+    def _run_ends(code):
+        """Para cada clase (identificador, numero, espacio) devuelve un arreglo que indica,
+        en cada posicion, donde termina el tramo de esa clase que empieza ahi"""
+        cp = np.frombuffer(code.encode('utf-32-le'), dtype=np.uint32)
+        n = len(cp)
+        low = cp < 128
+        if low.all():
+            classes = _ASCII_CLASSES[cp]
+        else:
+            # Los caracteres no ASCII se clasifican con los metodos de str, una vez por caracter distinto
+            classes = np.empty(n, dtype=np.uint8)
+            classes[low] = _ASCII_CLASSES[cp[low]]
+            unique, inverse = np.unique(cp[~low], return_inverse=True)
+            unique_classes = np.array([_char_class(chr(c)) for c in unique.tolist()], dtype=np.uint8)
+            classes[~low] = unique_classes[inverse]
+
+        positions = np.arange(n, dtype=np.intc)
+        ends = []
+        for bit in (_CLASS_IDENT, _CLASS_NUMBER, _CLASS_SPACE):
+            # Primera posicion >= i que no es de la clase: minimo acumulado desde el final
+            stops = np.where((classes & bit) != 0, n, positions).astype(np.intc)
+            ends.append(memoryview(np.minimum.accumulate(stops[::-1])[::-1].copy()))
+        return ends
+
+# Tipos de token que devuelve el escaner compilado
+TK_IDENTIFIER = 0
+TK_INTEGER = 1
+TK_DECIMAL = 2
+TK_STRING = 3
+TK_OPERATOR = 4
+TK_ERROR_DECIMAL = 5
+TK_ERROR_STRING = 6
+TK_ERROR_CHAR = 7
+
+# Tokens que caben en los buffers iniciales del escaner compilado; se duplican si se llenan
+SCAN_CHUNK = 64 * 1024
+
+if njit is not None:
+    @njit('i8(u1[:], i8[:], i8, i4[:], i4[:], i4[:], i4[:])', cache=True)
+    def _scan(buf, state, count, out_type, out_start, out_end, out_line):
+        """Escanea el codigo en UTF-8 y escribe (tipo, inicio, fin, linea) de cada token.
+
+        state tiene la posicion y la linea donde seguir, y count los tokens ya escritos.
+        Si los buffers se llenan se detiene y guarda en state donde quedo. Devuelve
+        cuantos tokens hay escritos, o -1 si encuentra un caracter no ASCII fuera de
+        un string o comentario (se deja al analizador en Python).
+        """
+        i = state[0]
+        line = state[1]
+        n = buf.shape[0]
+        capacity = out_type.shape[0]
+
+        while i < n:
+            # Un numero con dos puntos escribe dos tokens en una vuelta
+            if count + 2 > capacity:
+                state[0] = i
+                state[1] = line
+                return count
+
+            c = buf[i]
+
+            if c == 10:
+                line += 1
+                i += 1
+                continue
+
+            if c == 32 or 9 <= c <= 13 or 28 <= c <= 31:
+                i += 1
+                continue
+
+            if c >= 128:
+                return -1
+
+            if 65 <= c <= 90 or 97 <= c <= 122 or c == 95:
+                start = i
+                while i < n:
+                    c = buf[i]
+                    if not (65 <= c <= 90 or 97 <= c <= 122 or 48 <= c <= 57 or c == 95):
+                        break
+                    i += 1
+                out_type[count] = TK_IDENTIFIER
+                out_start[count] = start
+                out_end[count] = i
+                out_line[count] = line
+                count += 1
+                continue
+
+            if 48 <= c <= 57:
+                start = i
+                has_decimal = False
+                while i < n:
+                    c = buf[i]
+                    if c == 46:
+                        if has_decimal:
+                            out_type[count] = TK_ERROR_DECIMAL
+                            out_start[count] = i
+                            out_end[count] = i + 1
+                            out_line[count] = line
+                            count += 1
+                            break
+                        has_decimal = True
+                    elif not (48 <= c <= 57):
+                        break
+                    i += 1
+                out_type[count] = TK_DECIMAL if has_decimal else TK_INTEGER
+                out_start[count] = start
+                out_end[count] = i
+                out_line[count] = line
+                count += 1
+                continue
+
+            if c == 34:
+                start = i
+                i += 1
+                while i < n and buf[i] != 34 and buf[i] != 10:
+                    i += 1
+
+                if i >= n or buf[i] == 10:
+                    out_type[count] = TK_ERROR_STRING
+                    out_start[count] = start
+                    out_end[count] = i
+                    out_line[count] = line
+                    count += 1
+                    continue
+
+                i += 1
+                out_type[count] = TK_STRING
+                out_start[count] = start
+                out_end[count] = i
+                out_line[count] = line
+                count += 1
+                continue
+
+            if c == 47 and i + 1 < n and buf[i + 1] == 47:
+                while i < n and buf[i] != 10:
+                    i += 1
+                continue
+
+            # + - * / = ! < > & | ( ) { } [ ] ; ,
+            if (c == 43 or c == 45 or c == 42 or c == 47 or c == 61 or c == 33 or c == 60 or c == 62
+                    or c == 38 or c == 124 or c == 40 or c == 41 or c == 123 or c == 125
+                    or c == 91 or c == 93 or c == 59 or c == 44):
+                length = 1
+                if i + 1 < n:
+                    d = buf[i + 1]
+                    # == != <= >= && ||
+                    if ((d == 61 and (c == 61 or c == 33 or c == 60 or c == 62))
+                            or (c == 38 and d == 38) or (c == 124 and d == 124)):
+                        length = 2
+                out_type[count] = TK_OPERATOR
+                out_start[count] = i
+                out_end[count] = i + length
+                out_line[count] = line
+                count += 1
+                i += length
+                continue
+
+            out_type[count] = TK_ERROR_CHAR
+            out_start[count] = i
+            out_end[count] = i + 1
+            out_line[count] = line
+            count += 1
+            i += 1
+
+        state[0] = i
+        state[1] = line
+        return count
+
+    def _scan_numba(raw, first_line):
+        """Pasa el codigo por _scan y devuelve tuplas (tipo, inicio, fin, linea), o None"""
+        buf = np.frombuffer(bytearray(raw), dtype=np.uint8)
+        n = len(buf)
+        state = np.array([0, first_line], dtype=np.int64)
+        # Filas: tipo, inicio, fin, linea
+        out = np.empty((4, min(n, SCAN_CHUNK) + 2), dtype=np.int32)
+        count = 0
+        while True:
+            count = _scan(buf, state, count, out[0], out[1], out[2], out[3])
+            if count < 0:
+                return None
+            if state[0] >= n:
+                break
+            grown = np.empty((4, 2 * out.shape[1]), dtype=np.int32)
+            grown[:, :count] = out[:, :count]
+            out = grown
+        return zip(out[0, :count].tolist(), out[1, :count].tolist(),
+                   out[2, :count].tolist(), out[3, :count].tolist())
+else:
+    _scan = None
+
+def _error_message(line_num, detail):
+    return f"Error léxico en línea {line_num}: {detail}"
+
 class LexicalAnalyzer:
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.errors = []
+        self.error_lines = []
+        self.error_details = []
+        # Numero de lineas del ultimo codigo analizado (None si la tabla viene del archivo)
+        self.line_count = None
 
     def analyze(self, code):
+        """Tokeniza todo el codigo en una sola pasada, contando las lineas en cada salto de linea"""
         self.symbol_table.clear()
         self.errors = []
-        lines = code.split("\n")
+        self.error_lines = []
+        self.error_details = []
+
+        self._tokenize(code, 1)
+        self.line_count = code.count("\n") + 1
 
-        for line_num, line in enumerate(lines, 1):
-            self.tokenize_line(line, line_num)
+        self.symbol_table.save()
 
-    def tokenize_line(self, line, line_num):
+    def update_lines(self, text, first_line, last_line):
+        """Retokeniza solo las lineas editadas, sin tocar el archivo.
+
+        text son las lineas nuevas que reemplazan a las lineas first_line..last_line
+        del analisis anterior. Con last_line=None se reemplaza el analisis completo.
+        """
+        table = self.symbol_table
+        new_line_count = text.count("\n") + 1
+
+        if last_line is None:
+            lo, hi = 0, len(table.lines)
+            error_lo, error_hi = 0, len(self.error_lines)
+            delta = 0
+            self.line_count = first_line - 1 + new_line_count
+        else:
+            lo = bisect_left(table.lines, first_line)
+            hi = bisect_right(table.lines, last_line)
+            error_lo = bisect_left(self.error_lines, first_line)
+            error_hi = bisect_right(self.error_lines, last_line)
+            delta = new_line_count - (last_line - first_line + 1)
+            self.line_count += delta
+
+        # Se tokeniza al final de las listas y lo nuevo se empalma en [lo:hi]; las
+        # lineas posteriores solo se renumeran si cambio la cantidad de lineas
+        table_end = len(table.types)
+        errors_end = len(self.errors)
+        self._tokenize(text, first_line)
+
+        new_types, new_values, new_lines = (table.types[table_end:], table.values[table_end:],
+                                            table.lines[table_end:])
+        del table.types[table_end:], table.values[table_end:], table.lines[table_end:]
+        table.types[lo:hi] = new_types
+        table.values[lo:hi] = new_values
+        table.lines[lo:hi] = new_lines
+
+        new_errors, new_error_lines, new_error_details = (self.errors[errors_end:],
+                                                          self.error_lines[errors_end:],
+                                                          self.error_details[errors_end:])
+        del self.errors[errors_end:], self.error_lines[errors_end:], self.error_details[errors_end:]
+        self.errors[error_lo:error_hi] = new_errors
+        self.error_lines[error_lo:error_hi] = new_error_lines
+        self.error_details[error_lo:error_hi] = new_error_details
+
+        if delta:
+            tail = slice(lo + len(new_types), None)
+            table.lines[tail] = [line + delta for line in table.lines[tail]]
+
+            tail = slice(error_lo + len(new_errors), None)
+            self.error_lines[tail] = [line + delta for line in self.error_lines[tail]]
+            self.errors[tail] = [_error_message(line, detail)
+                                 for line, detail in zip(self.error_lines[tail], self.error_details[tail])]
+
+    def _tokenize(self, code, line_num):
+        """Usa el escaner en Cython si esta compilado, si no el de Numba, y si no el de Python"""
+        records = None
+        if lexer_c is not None or _scan is not None:
+            raw = code.encode('utf-8')
+            if lexer_c is not None:
+                records = lexer_c.scan(raw, line_num)
+            else:
+                records = _scan_numba(raw, line_num)
+
+        if records is None:
+            self._analyze_python(code, line_num)
+        else:
+            self._add_records(code, raw, records)
+
+    def _add_error(self, line_num, detail):
+        self.errors.append(_error_message(line_num, detail))
+        self.error_lines.append(line_num)
+        self.error_details.append(detail)
+
+    def _analyze_python(self, code, line_num):
         i = 0
-        n = len(line)
+        n = len(code)
+
+        # Con NumPy los finales de los tramos se calculan de una vez y el bucle
+        # salta directo al final de cada identificador, numero o espacio en blanco
+        if np is not None:
+            ident_ends, number_ends, space_ends = _run_ends(code)
+        else:
+            ident_ends = number_ends = space_ends = None
 
         while i < n:
-            char = line[i]
+            char = code[i]
 
-            if char.isspace():
+            if char == '\n':
+                line_num += 1
                 i += 1
                 continue
 
+            if char.isspace():
+                i = space_ends[i] if space_ends is not None else i + 1
+                continue
+
             if char.isalpha() or char == '_':
                 start = i
-                while i < n and (line[i].isalnum() or line[i] == '_'):
-                    i += 1
-                identifier = line[start:i]
+                if ident_ends is not None:
+                    i = ident_ends[i]
+                else:
+                    while i < n and (code[i] in _IDENT_CHARS or code[i].isalnum()):
+                        i += 1
+                identifier = code[start:i]
 
-                if identifier in CustomLanguage.KEYWORDS:
+                if identifier in CustomLanguage.KEYWORDS_SET:
                     self.symbol_table.add_symbol("PALABRA_RESERVADA", identifier, line_num)
                 else:
                     self.symbol_table.add_symbol("IDENTIFICADOR", identifier, line_num)
@@ -160,16 +568,25 @@ class LexicalAnalyzer:
             if char.isdigit():
                 start = i
                 has_decimal = False
-                while i < n and (line[i].isdigit() or line[i] == '.'):
-                    if line[i] == '.':
-                        if has_decimal:
-                            self.errors.append(
-                                f"Error léxico en línea {line_num}: Número con múltiples puntos decimales")
-                            break
+                if number_ends is not None:
+                    i = number_ends[i]
+                    dot = code.find('.', start, i)
+                    if dot != -1:
                         has_decimal = True
-                    i += 1
-
-                number = line[start:i]
+                        second_dot = code.find('.', dot + 1, i)
+                        if second_dot != -1:
+                            self._add_error(line_num, "Número con múltiples puntos decimales")
+                            i = second_dot
+                else:
+                    while i < n and (code[i] in _NUMBER_CHARS or code[i].isdigit()):
+                        if code[i] == '.':
+                            if has_decimal:
+                                self._add_error(line_num, "Número con múltiples puntos decimales")
+                                break
+                            has_decimal = True
+                        i += 1
+
+                number = code[start:i]
                 if has_decimal:
                     self.symbol_table.add_symbol("NUMERO_DECIMAL", number, line_num)
                 else:
@@ -177,47 +594,131 @@ class LexicalAnalyzer:
                 continue
 
             if char == '"':
-                start = i
-                i += 1
-                while i < n and line[i] != '"':
-                    i += 1
-
-                if i >= n:
-                    self.errors.append(f"Error léxico en línea {line_num}: String no cerrado")
-                    break
+                line_end = code.find('\n', i)
+                if line_end == -1:
+                    line_end = n
+                end = code.find('"', i + 1, line_end)
+
+                if end == -1:
+                    self._add_error(line_num, "String no cerrado")
+                    i = line_end
+                    continue
+
+                self.symbol_table.add_symbol("STRING", code[i:end + 1], line_num)
+                i = end + 1
+                continue
 
-                i += 1
-                string_literal = line[start:i]
-                self.symbol_table.add_symbol("STRING", string_literal, line_num)
+            if i + 1 < n and code[i] == '/' and code[i + 1] == '/':
+                i = code.find('\n', i)
+                if i == -1:
+                    i = n
                 continue
 
-            if i + 1 < n and line[i] == '/' and line[i + 1] == '/':
-                break
-
-            operators = ['+', '-', '*', '/', '=', '!', '<', '>', '&', '|', '(', ')', '{', '}', '[', ']', ';', ',']
-            if char in operators:
-                if i + 1 < n:
-                    two_char_op = char + line[i + 1]
-                    if two_char_op in ['==', '!=', '<=', '>=', '&&', '||']:
-                        self.symbol_table.add_symbol("OPERADOR", two_char_op, line_num)
-                        i += 2
-                        continue
+            if char in _OPERATORS:
+                two_char_op = code[i:i + 2]
+                if two_char_op in _TWO_CHAR_OPERATORS:
+                    self.symbol_table.add_symbol("OPERADOR", two_char_op, line_num)
+                    i += 2
+                    continue
 
                 self.symbol_table.add_symbol("OPERADOR", char, line_num)
                 i += 1
                 continue
 
-            self.errors.append(f"Error léxico en línea {line_num}: Carácter no reconocido '{char}'")
+            self._add_error(line_num, f"Carácter no reconocido '{char}'")
             i += 1
 
+    def _add_records(self, code, raw, records):
+        """Convierte las tuplas (tipo, inicio, fin, linea) de los escaneres compilados en simbolos y errores"""
+        # Solo los strings y comentarios pueden tener caracteres no ASCII; ahi los
+        # indices son de bytes y el valor se decodifica desde raw
+        text = code if len(raw) == len(code) else None
+
+        for kind, start, end, line_num in records:
+            value = text[start:end] if text is not None else raw[start:end].decode('utf-8')
+
+            if kind == TK_IDENTIFIER:
+                if value in CustomLanguage.KEYWORDS_SET:
+                    self.symbol_table.add_symbol("PALABRA_RESERVADA", value, line_num)
+                else:
+                    self.symbol_table.add_symbol("IDENTIFICADOR", value, line_num)
+            elif kind == TK_INTEGER:
+                self.symbol_table.add_symbol("NUMERO_ENTERO", value, line_num)
+            elif kind == TK_DECIMAL:
+                self.symbol_table.add_symbol("NUMERO_DECIMAL", value, line_num)
+            elif kind == TK_STRING:
+                self.symbol_table.add_symbol("STRING", value, line_num)
+            elif kind == TK_OPERATOR:
+                self.symbol_table.add_symbol("OPERADOR", value, line_num)
+            elif kind == TK_ERROR_DECIMAL:
+                self._add_error(line_num, "Número con múltiples puntos decimales")
+            elif kind == TK_ERROR_STRING:
+                self._add_error(line_num, "String no cerrado")
+            else:
+                self._add_error(line_num, f"Carácter no reconocido '{value}'")
+
+# Los archivos mas grandes que esto se leen por bloques desde un mmap
+MMAP_THRESHOLD = 4 * 1024 * 1024
+MMAP_CHUNK = 1024 * 1024
+
+def read_source(filename):
+    """Lee un archivo de codigo como UTF-8, con los saltos de linea normalizados a '\\n'"""
+    path = Path(filename)
+    if path.stat().st_size <= MMAP_THRESHOLD:
+        return path.read_text(encoding='utf-8', errors='replace')
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunks = [decoder.decode(mm[i:i + MMAP_CHUNK]) for i in range(0, len(mm), MMAP_CHUNK)]
+    chunks.append(decoder.decode(b'', final=True))
+    return "".join(chunks).replace('\r\n', '\n').replace('\r', '\n')
+
+class _IOSignals(QObject):
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+class _ReadTask(QRunnable):
+    """Lee un archivo de codigo en un hilo del QThreadPool y emite su contenido"""
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.signals = _IOSignals()
+
+    def run(self):
+        try:
+            content = read_source(self.filename)
+        except OSError as e:
+            self.signals.failed.emit(f"No se pudo abrir {self.filename}: {e}")
+        else:
+            self.signals.finished.emit(content)
+
+class _WriteTask(QRunnable):
+    """Guarda el codigo en un hilo del QThreadPool y emite el nombre del archivo"""
+    def __init__(self, filename, content):
+        super().__init__()
+        self.filename = filename
+        self.content = content
+        self.signals = _IOSignals()
+
+    def run(self):
+        try:
+            Path(self.filename).write_text(self.content, encoding='utf-8')
+        except OSError as e:
+            self.signals.failed.emit(f"No se pudo guardar {self.filename}: {e}")
+        else:
+            self.signals.finished.emit(self.filename)
+
 class CodeEditor(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ITCompiler")
         self.setGeometry(100, 100, 1600, 800)
 
-        self.symbol_table = SymbolTable()
         self.lexer = LexicalAnalyzer()
+        # Señales de las lecturas/escrituras en curso, para que vivan hasta que respondan
+        self._io_signals = set()
+        # Si el documento tiene separadores de linea U+2028 (ver _on_edit)
+        self._line_separators = False
 
         self.init_ui()
 
@@ -232,9 +733,17 @@ class CodeEditor(QMainWindow):
         self.symbol_table_display = QTextEdit()
         self.symbol_table_display.setReadOnly(True)
 
+        # Ultimo texto mostrado en cada panel, para no rehacer el layout si no cambia
+        self._last_symbols_text = None
+        self._last_errors_text = None
+
         self.compile_btn = QPushButton("Compilar")
         self.compile_btn.clicked.connect(self.compile_code)
 
+        # Los paneles se actualizan solo al compilar; mientras se escribe solo se
+        # mantiene al dia el analisis, porque redibujar la tabla completa congela la UI
+        self.editor.document().contentsChange.connect(self._on_edit)
+
         right_panel = QVBoxLayout()
         right_panel.addWidget(QLabel("Tabla de Símbolos:"))
         right_panel.addWidget(self.symbol_table_display)
@@ -285,27 +794,84 @@ class CodeEditor(QMainWindow):
         filename, _ = QFileDialog.getOpenFileName(self, "Abrir archivo", "",
                                                   "Archivos de texto (*.txt);;Todos los archivos (*)")
         if filename:
-            with open(filename, "r") as f:
-                content = f.read()
-                self.editor.setPlainText(content)
+            self._start_io(_ReadTask(filename), self._on_file_read)
 
     def save_file(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Guardar archivo", "",
                                                   "Archivos de texto (*.txt);;Todos los archivos (*)")
         if filename:
-            with open(filename, "w") as f:
-                f.write(self.editor.toPlainText())
+            self._start_io(_WriteTask(filename, self.editor.toPlainText()), self._on_file_saved)
+
+    def _start_io(self, task, on_finished):
+        """Lanza la tarea en el QThreadPool global; el resultado llega por señal al hilo de la UI"""
+        self._io_signals.add(task.signals)
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(self._on_io_failed)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_file_read(self, content):
+        self._io_signals.discard(self.sender())
+        self.editor.setPlainText(content)
+
+    def _on_file_saved(self, filename):
+        self._io_signals.discard(self.sender())
+
+    def _on_io_failed(self, message):
+        self._io_signals.discard(self.sender())
+        self.error_display.setPlainText(message)
+        self._last_errors_text = message
+
+    def _on_edit(self, position, chars_removed, chars_added):
+        """Retokeniza solo los bloques tocados por la edicion"""
+        doc = self.editor.document()
+        end = min(position + chars_added, doc.characterCount() - 1)
+        first = doc.findBlock(position).blockNumber()
+        last = doc.findBlock(end).blockNumber()
+
+        lines = []
+        block = doc.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            lines.append(block.text())
+            block = block.next()
+
+        # Shift+Enter mete U+2028 dentro de un bloque, y toPlainText() lo cuenta como
+        # salto de linea: mientras el documento tenga alguno, los bloques no
+        # coinciden con las lineas y se retokeniza todo
+        if any('\u2028' in line for line in lines):
+            self._line_separators = True
+
+        old_last = None
+        if self.lexer.line_count is not None and not self._line_separators:
+            old_last = last - (doc.blockCount() - self.lexer.line_count)
+        if old_last is None or first < 0 or last < first or old_last < first:
+            self.lexer.update_lines(doc.toPlainText(), 1, None)
+            if self._line_separators:
+                self._line_separators = '\u2028' in doc.toRawText()
+        else:
+            self.lexer.update_lines("\n".join(lines), first + 1, old_last + 1)
 
     def compile_code(self):
-        code = self.editor.toPlainText()
-        self.lexer.analyze(code)
+        # _on_edit ya dejo el analisis al dia con el documento; solo falta guardarlo
+        if self.lexer.line_count is not None:
+            self.lexer.symbol_table.save()
+        else:
+            self.lexer.analyze(self.editor.toPlainText())
+        self._refresh_displays()
 
-        self.symbol_table_display.setPlainText(str(self.lexer.symbol_table))
+    def _refresh_displays(self):
+        """Actualiza los paneles, sin llamar a setPlainText si el texto no cambio"""
+        symbols_text = str(self.lexer.symbol_table)
+        if symbols_text != self._last_symbols_text:
+            self.symbol_table_display.setPlainText(symbols_text)
+            self._last_symbols_text = symbols_text
 
         if self.lexer.errors:
-            self.error_display.setPlainText("\n".join(self.lexer.errors))
+            errors_text = "\n".join(self.lexer.errors)
         else:
-            self.error_display.setPlainText("Compilación exitosa. No se encontraron errores léxicos.")
+            errors_text = "Compilación exitosa. No se encontraron errores léxicos."
+        if errors_text != self._last_errors_text:
+            self.error_display.setPlainText(errors_text)
+            self._last_errors_text = errors_text
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Escaner lexico en Cython para ITCompiler.
+
+Hace lo mismo que _scan en ITCompiler.py; los tipos de token tienen que
+coincidir con las constantes TK_* de ese modulo.
+"""
+from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
+
+cdef enum:
+    TK_IDENTIFIER = 0
+    TK_INTEGER = 1
+    TK_DECIMAL = 2
+    TK_STRING = 3
+    TK_OPERATOR = 4
+    TK_ERROR_DECIMAL = 5
+    TK_ERROR_STRING = 6
+    TK_ERROR_CHAR = 7
+
+# Tokens que caben en el buffer inicial; se duplica si se llena
+cdef Py_ssize_t SCAN_CHUNK = 64 * 1024
+
+# Clases de caracter
+cdef enum:
+    C_OTHER = 0
+    C_NEWLINE = 1
+    C_SPACE = 2
+    C_ALPHA = 3
+    C_DIGIT = 4
+    C_DOT = 5
+    C_QUOTE = 6
+    C_SLASH = 7
+    C_OPERATOR = 8
+    C_HIGH = 9
+
+cdef unsigned char CLASS[256]
+
+cdef void _init_classes():
+    cdef int c
+    for c in range(256):
+        if c >= 128:
+            CLASS[c] = C_HIGH
+        elif c == 10:
+            CLASS[c] = C_NEWLINE
+        elif c == 32 or 9 <= c <= 13 or 28 <= c <= 31:
+            CLASS[c] = C_SPACE
+        elif 65 <= c <= 90 or 97 <= c <= 122 or c == 95:
+            CLASS[c] = C_ALPHA
+        elif 48 <= c <= 57:
+            CLASS[c] = C_DIGIT
+        else:
+            CLASS[c] = C_OTHER
+    CLASS[ord('.')] = C_DOT
+    CLASS[ord('"')] = C_QUOTE
+    CLASS[ord('/')] = C_SLASH
+    for c in b"+-*=!<>&|(){}[];,":
+        CLASS[c] = C_OPERATOR
+
+_init_classes()
+
+cdef inline Py_ssize_t _emit(int* out, Py_ssize_t count, int kind, Py_ssize_t start,
+                             Py_ssize_t end, long line) nogil:
+    out[4 * count] = kind
+    out[4 * count + 1] = <int>start
+    out[4 * count + 2] = <int>end
+    out[4 * count + 3] = <int>line
+    return count + 1
+
+cdef Py_ssize_t tokenize(const unsigned char* s, Py_ssize_t n, Py_ssize_t* pos, long* line_ptr,
+                         int* out, Py_ssize_t count, Py_ssize_t capacity) nogil:
+    """Escribe (tipo, inicio, fin, linea) de cada token en out desde *pos.
+
+    Si out se llena se detiene y deja en *pos y *line_ptr donde seguir. Devuelve
+    cuantos tokens hay escritos o -1.
+    """
+    cdef Py_ssize_t i = pos[0]
+    cdef long line = line_ptr[0]
+    cdef Py_ssize_t start
+    cdef Py_ssize_t length
+    cdef unsigned char c, d, cls
+    cdef bint has_decimal
+
+    while i < n:
+        # Un numero con dos puntos escribe dos tokens en una vuelta
+        if count + 2 > capacity:
+            break
+
+        c = s[i]
+        cls = CLASS[c]
+
+        if cls == C_NEWLINE:
+            line += 1
+            i += 1
+            continue
+
+        if cls == C_SPACE:
+            i += 1
+            continue
+
+        if cls == C_HIGH:
+            return -1
+
+        if cls == C_ALPHA:
+            start = i
+            while i < n and (CLASS[s[i]] == C_ALPHA or CLASS[s[i]] == C_DIGIT):
+                i += 1
+            count = _emit(out, count, TK_IDENTIFIER, start, i, line)
+            continue
+
+        if cls == C_DIGIT:
+            start = i
+            has_decimal = False
+            while i < n:
+                cls = CLASS[s[i]]
+                if cls == C_DOT:
+                    if has_decimal:
+                        count = _emit(out, count, TK_ERROR_DECIMAL, i, i + 1, line)
+                        break
+                    has_decimal = True
+                elif cls != C_DIGIT:
+                    break
+                i += 1
+            count = _emit(out, count, TK_DECIMAL if has_decimal else TK_INTEGER, start, i, line)
+            continue
+
+        if cls == C_QUOTE:
+            start = i
+            i += 1
+            while i < n and s[i] != c'"' and s[i] != c'\n':
+                i += 1
+
+            if i >= n or s[i] == c'\n':
+                count = _emit(out, count, TK_ERROR_STRING, start, i, line)
+                continue
+
+            i += 1
+            count = _emit(out, count, TK_STRING, start, i, line)
+            continue
+
+        if cls == C_SLASH and i + 1 < n and s[i + 1] == c'/':
+            while i < n and s[i] != c'\n':
+                i += 1
+            continue
+
+        if cls == C_OPERATOR or cls == C_SLASH:
+            length = 1
+            if i + 1 < n:
+                d = s[i + 1]
+                if ((d == c'=' and (c == c'=' or c == c'!' or c == c'<' or c == c'>'))
+                        or (c == c'&' and d == c'&') or (c == c'|' and d == c'|')):
+                    length = 2
+            count = _emit(out, count, TK_OPERATOR, i, i + length, line)
+            i += length
+            continue
+
+        count = _emit(out, count, TK_ERROR_CHAR, i, i + 1, line)
+        i += 1
+
+    pos[0] = i
+    line_ptr[0] = line
+    return count
+
+def scan(bytes code, long first_line=1):
+    """Escanea el codigo en UTF-8 y devuelve una lista de tuplas (tipo, inicio, fin, linea).
+
+    Devuelve None si hay caracteres no ASCII fuera de un string o comentario.
+    """
+    cdef Py_ssize_t n = len(code)
+    cdef const unsigned char* s = code
+    cdef Py_ssize_t count = 0
+    cdef Py_ssize_t k
+    cdef Py_ssize_t pos = 0
+    cdef long line = first_line
+    cdef Py_ssize_t capacity = min(n, SCAN_CHUNK) + 2
+    cdef int* grown
+    cdef int* out = <int*>PyMem_Malloc(4 * capacity * sizeof(int))
+    if out == NULL:
+        raise MemoryError()
+
+    try:
+        while True:
+            with nogil:
+                count = tokenize(s, n, &pos, &line, out, count, capacity)
+            if count < 0:
+                return None
+            if pos >= n:
+                break
+            capacity *= 2
+            grown = <int*>PyMem_Realloc(out, 4 * capacity * sizeof(int))
+            if grown == NULL:
+                raise MemoryError()
+            out = grown
+        return [(out[4 * k], out[4 * k + 1], out[4 * k + 2], out[4 * k + 3]) for k in range(count)]
+    finally:
+        PyMem_Free(out)
@@ -0,0 +1,8 @@
+"""Compila el escaner en Cython: python setup.py build_ext --inplace"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="ITCompiler",
+    ext_modules=cythonize("lexer_c.pyx", language_level=3),
+)